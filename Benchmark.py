@@ -0,0 +1,362 @@
+# Benchmark Code
+
+import argparse
+import json
+import platform
+import time
+import numpy as np
+from Poker import Cards, Deck, Equity, Table, Players, CallingStrategy, RandomStrategy
+
+class Benchmark:
+    '''Class for Benchmarks of the Core Paths'''
+
+    # Measurement #
+
+    '''
+    This section of the class times operations. Every benchmark is a function that performs a number of
+    operations and returns the nanoseconds they took (leaving out any setup between them); the best of
+    several repeats is kept
+
+    Static Attributes:
+        repeats (int): Number of times every benchmark is repeated
+        results (dict): List of all benchmark names and their results
+    '''
+
+    repeats = 5
+    results = {}
+
+    def measure(name, benchmark, number_of_operations, unit = 'op'):
+
+        '''
+        Runs a benchmark, then records and prints its result
+
+        Arguments:
+            name (str): Name of the benchmark
+            benchmark (function): Function taking a number of operations and returning the nanoseconds they took
+            number_of_operations (int): Number of operations per repeat
+            unit (str): What one operation is, such as 'op' or 'hand'
+        '''
+
+        nanoseconds = min(benchmark(number_of_operations) for r in range (Benchmark.repeats)) / number_of_operations
+        Benchmark.results[name] = {'ns_per_op': nanoseconds, f'{unit}s_per_sec': 1e9 / nanoseconds, 'operations': number_of_operations}
+        print(f'{name:<40} {nanoseconds:>12.1f} ns/{unit} {1e9 / nanoseconds:>14.0f} {unit}s/sec')
+
+    # Hand Strength #
+
+    '''
+    This section of the class benchmarks the evaluator, for every number of cards and hand category
+    '''
+
+    def hands_by_category(number_of_cards, hands_per_category, generator):
+
+        '''
+        Deals random hands and sorts them by category. Straight and royal flushes are too rare to deal, so
+        they are built from a random suit (and random straight) plus random other cards
+
+        Arguments:
+            number_of_cards (int): Number of cards per hand
+            hands_per_category (int): Number of hands wanted in every category
+            generator (Generator): Random number generator
+
+        Returns:
+            dict: List of all hand categories and their hands, as lists of codes
+        '''
+
+        strengths = np.array(Cards.strength_table)
+        hands = {category: [] for category in Cards.hand_names}
+
+        for attempt in range (20):
+            codes = Deck.shuffled_decks(100000, generator)[:, :number_of_cards]
+            categories = strengths[Cards.evaluate_many(codes)].astype(int)
+            for category in hands:
+                missing = hands_per_category - len(hands[category])
+                if missing > 0:
+                    hands[category].extend(codes[categories == category][:missing].tolist())
+
+            if all(len(hands[category]) >= hands_per_category for category in (1, 2, 3, 4, 5, 6, 7, 8)):
+                break
+
+        for category in (9, 10):
+            while len(hands[category]) < hands_per_category:
+                higher_end_of_straight = 14 if category == 10 else int(generator.integers(5, 14))
+                suit = int(generator.integers(4))
+                ranks = [14 if r == 1 else r for r in range (higher_end_of_straight - 4, higher_end_of_straight + 1)]
+                hand = [(r - 2) * 4 + suit for r in ranks]
+                others = [c for c in generator.permutation(52).tolist() if c not in hand]
+                hand.extend(others[:number_of_cards - 5])
+                if int(Cards.strength_table[Cards.evaluate_codes(hand)]) == category:
+                    hands[category].append(hand)
+
+        return hands
+
+    def benchmark_hand_strength(number_of_operations, generator):
+
+        '''
+        Benchmarks compute_hand_strength for 5, 6 and 7 cards in every category, and evaluate_many for
+        batches of 5, 6 and 7 cards
+
+        Arguments:
+            number_of_operations (int): Number of hands per benchmark
+            generator (Generator): Random number generator
+        '''
+
+        for number_of_cards in (5, 6, 7):
+            hands = Benchmark.hands_by_category(number_of_cards, number_of_operations, generator)
+            for category in hands:
+                list_of_hands = [[Cards.cards[c] for c in hand] for hand in hands[category]]
+
+                def benchmark(n):
+                    start = time.perf_counter_ns()
+                    for h in range (n):
+                        Cards.compute_hand_strength(list_of_hands[h % len(list_of_hands)])
+                    return time.perf_counter_ns() - start
+
+                Benchmark.measure(f'compute_hand_strength/{number_of_cards}/{Cards.hand_names[category]}', benchmark, number_of_operations)
+
+        for number_of_cards in (5, 6, 7):
+            codes = Deck.shuffled_decks(100 * number_of_operations, generator)[:, :number_of_cards]
+            Cards.evaluate_many(codes[:1])
+
+            def benchmark(n):
+                start = time.perf_counter_ns()
+                Cards.evaluate_many(codes[:n])
+                return time.perf_counter_ns() - start
+
+            Benchmark.measure(f'evaluate_many/{number_of_cards}', benchmark, len(codes), 'hand')
+
+    # River Equity #
+
+    '''
+    This section of the class benchmarks exact equity on complete boards, where the only runout is the board
+    itself, after checking every result against compute_hand_strength
+    '''
+
+    def benchmark_river_equity(number_of_operations, generator):
+
+        '''
+        Checks and benchmarks exact_equity for 2 to 4 players on random rivers
+
+        Arguments:
+            number_of_operations (int): Number of spots per benchmark
+            generator (Generator): Random number generator
+
+        Raises:
+            RuntimeError: If a result doesn't match the strengths of the hands
+        '''
+
+        for number_of_players in (2, 3, 4):
+            decks = Deck.shuffled_decks(number_of_operations, generator).tolist()
+            spots = [([deck[2 * p:2 * p + 2] for p in range (number_of_players)], deck[2 * number_of_players:2 * number_of_players + 5]) for deck in decks]
+
+            for holdings_list, board in spots:
+                strengths = [Cards.compute_hand_strength([Cards.cards[c] for c in holdings + board]) for holdings in holdings_list]
+                winners = [s == max(strengths) for s in strengths]
+                results = Equity.exact_equity(holdings_list, board)
+                for p in range (number_of_players):
+                    if results[p]['equity'] != (1 / sum(winners) if winners[p] else 0.0):
+                        raise RuntimeError(f'exact_equity disagrees with compute_hand_strength on {holdings_list} {board}')
+
+            def benchmark(n):
+                start = time.perf_counter_ns()
+                for s in range (n):
+                    Equity.cache.clear()
+                    Equity.exact_equity(*spots[s % len(spots)])
+                return time.perf_counter_ns() - start
+
+            Benchmark.measure(f'exact_equity/river/{number_of_players}_players', benchmark, number_of_operations)
+
+    # Deck #
+
+    '''
+    This section of the class benchmarks dealing: a new deck, then the cards of a 9 player hand (18 hole
+    cards, 5 community cards and 3 burned cards)
+    '''
+
+    def benchmark_deck(number_of_operations, generator):
+
+        '''
+        Benchmarks new_deck followed by dealing a full hand
+
+        Arguments:
+            number_of_operations (int): Number of decks per benchmark
+            generator (Generator): Random number generator
+        '''
+
+        deck = Deck(generator)
+
+        def benchmark(n):
+            start = time.perf_counter_ns()
+            for d in range (n):
+                deck.new_deck()
+                for c in range (23):
+                    deck.deal()
+                for c in range (3):
+                    deck.burn()
+            return time.perf_counter_ns() - start
+
+        Benchmark.measure('deck/new_deck+deal', benchmark, number_of_operations)
+
+    # Pots #
+
+    '''
+    This section of the class benchmarks awarding pots at showdown, with every player all in for a different
+    amount so that every player has their own side pot
+    '''
+
+    def set_up_showdown(table, generator):
+
+        '''
+        Puts a table at the end of the river: random holdings and board, and every player all in for a
+        different amount
+
+        Arguments:
+            table (Table): Table to set up
+            generator (Generator): Random number generator
+        '''
+
+        table.deck.new_deck()
+        table.community_cards.clear()
+        for c in range (5):
+            table.community_cards.append(table.deck.deal())
+
+        for p in range (len(table.list_of_players)):
+            player = table.list_of_players[p]
+            player.reset_player_status()
+            player.holdings.extend([table.deck.deal(), table.deck.deal()])
+            player.stack = 500
+            player.bet = 25 * (p + 1) + int(generator.integers(25))
+            player.all_in = True
+
+        table.number_of_active_players = len(table.list_of_players)
+        table.update_player_hands()
+        table.pot_size = 0
+        table.round_in_progress = True
+
+    def benchmark_pots(number_of_operations, generator):
+
+        '''
+        Benchmarks collecting the bets into the pot, then building the side pots and awarding them, for 2 to
+        10 players
+
+        Arguments:
+            number_of_operations (int): Number of showdowns per benchmark
+            generator (Generator): Random number generator
+        '''
+
+        for number_of_players in range (2, 11):
+            table = Table(headless = True, seed = generator)
+            for p in range (number_of_players):
+                Players(f'Player {p+1}', CallingStrategy(), table)
+
+            def benchmark(n):
+                elapsed = 0
+                for s in range (n):
+                    Benchmark.set_up_showdown(table, generator)
+                    start = time.perf_counter_ns()
+                    table.set_pot()
+                    table.award_pots()
+                    elapsed += time.perf_counter_ns() - start
+                return elapsed
+
+            Benchmark.measure(f'award_pots/{number_of_players}_players', benchmark, number_of_operations)
+
+    # Hands #
+
+    '''
+    This section of the class benchmarks complete headless hands between bots, with stacks topped back up
+    before every hand so that nobody busts
+    '''
+
+    def benchmark_hands(number_of_operations, generator):
+
+        '''
+        Benchmarks complete hands for 3, 6 and 9 players
+
+        Arguments:
+            number_of_operations (int): Number of hands per benchmark
+            generator (Generator): Random number generator
+        '''
+
+        for number_of_players in (3, 6, 9):
+            table = Table(headless = True, seed = generator)
+            for p in range (number_of_players):
+                strategy = RandomStrategy(generator) if p % 2 else CallingStrategy()
+                Players(f'Player {p+1}', strategy, table)
+
+            def benchmark(n):
+                elapsed = 0
+                for h in range (n):
+                    for p in range (len(table.list_of_players)):
+                        table.list_of_players[p].stack = 500
+                    start = time.perf_counter_ns()
+                    table.play_round()
+                    elapsed += time.perf_counter_ns() - start
+                return elapsed
+
+            Benchmark.measure(f'hand/{number_of_players}_players', benchmark, number_of_operations, 'hand')
+
+    # Report #
+
+    '''
+    This section of the class saves results as JSON and compares them with an earlier run
+    '''
+
+    def save(path):
+
+        '''
+        Saves the results, along with the environment they were measured in
+
+        Arguments:
+            path (str): Path of the JSON file
+        '''
+
+        report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeats': Benchmark.repeats,
+            'results': Benchmark.results,
+        }
+
+        with open(path, 'w') as f:
+            json.dump(report, f, indent = 2)
+
+    def compare(path):
+
+        '''
+        Prints how every result changed since an earlier run
+
+        Arguments:
+            path (str): Path of the JSON file of the earlier run
+        '''
+
+        with open(path) as f:
+            earlier = json.load(f)['results']
+
+        print(f'\nCompared with {path} (positive is faster):')
+        for name in Benchmark.results:
+            if name in earlier:
+                change = earlier[name]['ns_per_op'] / Benchmark.results[name]['ns_per_op'] - 1
+                print(f'{name:<40} {change:>+8.1%}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Benchmarks the evaluator, dealing, pot awarding and complete hands')
+    parser.add_argument('--quick', action = 'store_true', help = 'run fewer operations per benchmark')
+    parser.add_argument('--output', default = 'benchmark.json', help = 'path of the JSON results')
+    parser.add_argument('--compare', help = 'path of earlier JSON results to compare with')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed of the random number generator')
+    arguments = parser.parse_args()
+
+    scale = 1 if arguments.quick else 10
+    generator = np.random.default_rng(arguments.seed)
+
+    Benchmark.benchmark_hand_strength(1000 * scale, generator)
+    Benchmark.benchmark_river_equity(100 * scale, generator)
+    Benchmark.benchmark_deck(1000 * scale, generator)
+    Benchmark.benchmark_pots(200 * scale, generator)
+    Benchmark.benchmark_hands(100 * scale, generator)
+
+    Benchmark.save(arguments.output)
+    if arguments.compare:
+        Benchmark.compare(arguments.compare)